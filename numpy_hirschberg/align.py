@@ -17,20 +17,35 @@ Another good visual analysis is in the `blog post by Piotr Turski`_.
     https://en.wikipedia.org/wiki/Needleman-Wunsch_algorithm
 """
 
-from typing import Tuple
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Optional, Tuple
 
 import numpy as np
 from numpy import add, full, concatenate, empty, fmax, flipud
 
-from numpy_hirschberg.types import Vector, FloatVector, VectorItem, CostFunction
+from numpy_hirschberg.types import (
+    Vector,
+    FloatVector,
+    VectorItem,
+    CostFunction,
+    ScoreType,
+)
 
+SCORE_DTYPES = (np.int16, np.int32, np.float32, np.float64)
+"""Data types accepted for the score rows."""
 
-def align(  # pylint: disable=too-many-locals
+PARALLEL_MIN_CELLS = 1 << 16
+"""Smallest backward pass (source by target items) worth a background thread."""
+
+
+def align(  # pylint: disable=too-many-arguments
     source: Vector,
     target: Vector,
     cost_function: CostFunction,
-    deletion_cost: int = 100,
-    insertion_cost: int = 0,
+    deletion_cost: float = 100,
+    insertion_cost: float = 0,
+    score_dtype: Optional[ScoreType] = None,
+    parallel: bool = False,
 ) -> Tuple[Vector, Vector, float]:
     """
     Divide and conquer approach to sequence alignment problem invented by Dan Hirschberg.
@@ -41,12 +56,20 @@ def align(  # pylint: disable=too-many-locals
     The function returns the best possible solution as a tuple of the source and target vectors
     padded with None (insertion or deletion) and a total score of transformation.
 
+    On each step the upper half of the source is scored forward and the lower half backward.
+    These passes are independent, so with ``parallel`` set the backward one runs
+    in a background thread. The score rows are calculated by NumPy, which releases the GIL
+    on long enough vectors, so the gain depends on the target length and the cost function.
+
     :param source: one vector
     :param target: another vector
     :param deletion_cost: fixed price for the source item deletion
     :param insertion_cost: fixed price for the target item insertion
     :param cost_function: dynamic replacement cost algorithm
+    :param score_dtype: data type of the score rows, see :func:`score_matrix`
+    :param parallel: run the forward and backward score passes concurrently
     :return: a tuple of padded source and target vectors, and a total cost
+    :raises ValueError: if the score type is not supported
 
     .. _Wikipedia article:
         https://en.wikipedia.org/wiki/Hirschberg's_algorithm
@@ -54,6 +77,51 @@ def align(  # pylint: disable=too-many-locals
     .. _blog post by Piotr Turski:
         http://blog.piotrturski.net/2015/04/hirschbergs-algorithm-explanation.html
     """
+    # short vectors never reach the score matrix, check the type for any length
+    score_type(score_dtype, None, deletion_cost, insertion_cost)
+
+    if not parallel:
+        return divide_and_align(
+            source, target, cost_function, deletion_cost, insertion_cost, score_dtype
+        )
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return divide_and_align(
+            source,
+            target,
+            cost_function,
+            deletion_cost,
+            insertion_cost,
+            score_dtype,
+            executor,
+        )
+
+
+def divide_and_align(  # pylint: disable=too-many-arguments,too-many-locals
+    source: Vector,
+    target: Vector,
+    cost_function: CostFunction,
+    deletion_cost: float,
+    insertion_cost: float,
+    score_dtype: Optional[ScoreType],
+    executor: Optional[Executor] = None,
+) -> Tuple[Vector, Vector, float]:
+    """
+    Recursive part of the :func:`align`.
+
+    If an executor is given, the backward score pass is submitted to it
+    while the forward one runs in the current thread. Passes smaller than
+    :data:`PARALLEL_MIN_CELLS` run in the current thread too.
+
+    :param source: one vector
+    :param target: another vector
+    :param cost_function: dynamic replacement cost algorithm
+    :param deletion_cost: fixed price for the source item deletion
+    :param insertion_cost: fixed price for the target item insertion
+    :param score_dtype: data type of the score rows
+    :param executor: a pool for the backward score pass, if any
+    :return: a tuple of padded source and target vectors, and a total cost
+    """
     source_length, target_length = len(source), len(target)
 
     if source_length == 0 and target_length == 0:
@@ -82,32 +150,55 @@ def align(  # pylint: disable=too-many-locals
         return indices, target, insertion_cost * (target_length - 1) - cost
 
     cut_row: int = int(source_length / 2)
-    upper_score: Vector = score_matrix(
-        source[:cut_row], target, cost_function, deletion_cost, insertion_cost
-    )
-    lower_score: Vector = score_matrix(
+    # flipud() gives reversed views, the halves are not copied
+    lower_arguments = (
         flipud(source[cut_row:]),
         flipud(target),
         cost_function,
         deletion_cost,
         insertion_cost,
+        score_dtype,
+    )
+    lower_future = (
+        executor.submit(score_matrix, *lower_arguments)
+        if executor and (source_length - cut_row) * target_length >= PARALLEL_MIN_CELLS
+        else None
     )
 
-    max_index: int = int(np.argmax(upper_score + flipud(lower_score)))
+    upper_score: Vector = score_matrix(
+        source[:cut_row],
+        target,
+        cost_function,
+        deletion_cost,
+        insertion_cost,
+        score_dtype,
+    )
+    lower_score: Vector = (
+        lower_future.result() if lower_future else score_matrix(*lower_arguments)
+    )
 
-    left_source, left_target, left_cost = align(
+    # the sum may not fit into a narrow score type
+    max_index: int = int(
+        np.argmax(add(upper_score, flipud(lower_score), dtype=np.float64))
+    )
+
+    left_source, left_target, left_cost = divide_and_align(
         source[:cut_row],
         target[:max_index],
         cost_function,
         deletion_cost,
         insertion_cost,
+        score_dtype,
+        executor,
     )
-    right_source, right_target, right_cost = align(
+    right_source, right_target, right_cost = divide_and_align(
         source[cut_row:],
         target[max_index:],
         cost_function,
         deletion_cost,
         insertion_cost,
+        score_dtype,
+        executor,
     )
 
     return (
@@ -117,12 +208,13 @@ def align(  # pylint: disable=too-many-locals
     )
 
 
-def score_matrix(  # pylint: disable=too-many-locals
+def score_matrix(  # pylint: disable=too-many-arguments,too-many-locals
     source: Vector,
     target: Vector,
     cost_function: CostFunction,
-    deletion_cost: int = 100,
-    insertion_cost: int = 10,
+    deletion_cost: float = 100,
+    insertion_cost: float = 10,
+    score_dtype: Optional[ScoreType] = None,
 ) -> Vector:
     """
     Build a [virtual] matrix of transformation scores for the given source and target vectors,
@@ -130,48 +222,139 @@ def score_matrix(  # pylint: disable=too-many-locals
 
     Rules for the score matrix are described in the `Needleman-Wunsch algorithm`_
 
+    Each row is calculated with vector operations, the insertions as a running maximum.
+    The rows are kept in the ``score_dtype`` - one of :data:`SCORE_DTYPES`. Every score
+    must fit into a type given explicitly: the bounds are checked from the vector lengths
+    and the largest cost. By default the type is derived from the fixed prices and
+    the cost function result.
+
     :param source: one vector
     :param target: another vector
     :param deletion_cost: fixed price for the source item deletion
     :param insertion_cost: fixed price for the target item insertion
     :param cost_function: dynamic replacement cost algorithm
+    :param score_dtype: data type of the score rows
     :return: the last line of the score matrix
+    :raises ValueError: if the score type is not supported
+    :raises TypeError: if the cost values can't be cast to the score type
+    :raises OverflowError: if the scores may not fit into the score type
 
     .. _Needleman-Wunsch algorithm:
         https://en.wikipedia.org/wiki/Needleman-Wunsch_algorithm
     """
     source_length, target_length = len(source), len(target)
-
-    if source_length == 0:
-        return add.accumulate(full(target_length, insertion_cost))
-
-    if target_length == 0:
-        return add.accumulate(full(source_length, deletion_cost))
+    # scores along the insertion ramp are shifted by up to one more full length
+    steps: int = 2 * (source_length + target_length)
+    gap_cost: float = max(abs(deletion_cost), abs(insertion_cost))
+
+    if source_length == 0 or target_length == 0:
+        dtype = score_type(score_dtype, None, deletion_cost, insertion_cost)
+        if score_dtype is not None:
+            check_score_bounds(dtype, steps, gap_cost)
+        if source_length == 0:
+            return add.accumulate(full(target_length, insertion_cost, dtype=dtype))
+        return add.accumulate(full(source_length, deletion_cost, dtype=dtype))
+
+    costs: Vector = cost_function(source[0], target)
+    dtype = score_type(score_dtype, costs.dtype, deletion_cost, insertion_cost)
+    if score_dtype is not None:
+        check_score_bounds(dtype, steps, gap_cost)
 
     full_deletion_column: Vector = add.accumulate(
-        concatenate(([0], full(source_length, deletion_cost)))
+        concatenate(([0], full(source_length, deletion_cost))), dtype=dtype
     )
     full_insertion_row: Vector = add.accumulate(
-        concatenate(([0], full(target_length, insertion_cost)))
+        concatenate(([0], full(target_length, insertion_cost))), dtype=dtype
     )
 
-    row1: Vector = full_insertion_row
-    row2: Vector = empty([target_length], dtype=np.int32)
+    row1: Vector = full_insertion_row.copy()
+    row2: Vector = empty([target_length + 1], dtype=dtype)
 
     for i in range(source_length):
-        replacement_score = row1[:-1] - cost_function(source[i], target)
-        deletion_score = row1[1:] + deletion_cost
-        replacement_deletion_score_max = fmax(replacement_score, deletion_score)
-
-        for j in range(target_length):
-            insertion_score = insertion_cost + (
-                full_deletion_column[i + 1] if j == 0 else row2[j - 1]
-            )
-            row2[j] = max(replacement_deletion_score_max[j], insertion_score)
-        row1 = concatenate(([full_deletion_column[i + 1]], row2))
+        if i > 0:
+            costs = cost_function(source[i], target)
+        if score_dtype is not None:
+            check_score_bounds(dtype, steps, np.max(np.abs(costs)))
+
+        row2[0] = full_deletion_column[i + 1]
+        fmax(
+            row1[:-1] - costs.astype(dtype, copy=False),
+            row1[1:] + dtype.type(deletion_cost),
+            out=row2[1:],
+        )
+        # row2[j] = max(row2[j], row2[j - 1] + insertion_cost) unrolled as a running maximum
+        # of the scores shifted down the insertion ramp
+        row2 -= full_insertion_row
+        fmax.accumulate(row2, out=row2)
+        row2 += full_insertion_row
+        row1, row2 = row2, row1
     return row1
 
 
+def score_type(
+    score_dtype: Optional[ScoreType],
+    cost_dtype: Optional[np.dtype],
+    deletion_cost: float,
+    insertion_cost: float,
+) -> np.dtype:
+    """
+    Choose the data type of the score rows.
+
+    The type given explicitly must be one of :data:`SCORE_DTYPES` and able to hold
+    the cost values without truncation. Otherwise, the common type of the costs is used.
+
+    :param score_dtype: requested data type or None
+    :param cost_dtype: data type of the cost function result, if known
+    :param deletion_cost: fixed price for the source item deletion
+    :param insertion_cost: fixed price for the target item insertion
+    :return: the score data type
+    :raises ValueError: if the requested type is not supported
+    :raises TypeError: if the cost values can't be cast to the requested type
+    """
+    cost_types = [np.asarray(deletion_cost).dtype, np.asarray(insertion_cost).dtype]
+    if cost_dtype is not None:
+        cost_types.append(cost_dtype)
+
+    if score_dtype is None:
+        return np.result_type(*cost_types)
+
+    try:
+        dtype: np.dtype = np.dtype(score_dtype)
+    except TypeError as error:
+        raise ValueError(f"Unsupported score type {score_dtype}") from error
+    if dtype not in SCORE_DTYPES:
+        raise ValueError(f"Unsupported score type {dtype}")
+
+    for cost_type in cost_types:
+        if not np.can_cast(cost_type, dtype, casting="same_kind"):
+            raise TypeError(f"Can't cast {cost_type} costs to the score type {dtype}")
+    return dtype
+
+
+def check_score_bounds(dtype: np.dtype, steps: int, max_cost: float) -> None:
+    """
+    Make sure a score built from the given number of steps fits into the data type.
+
+    Each cell of the score matrix is a sum of no more than (steps) costs.
+
+    :param dtype: the score data type
+    :param steps: total length of the source and target vectors
+    :param max_cost: the largest absolute value of a single cost
+    :raises OverflowError: if the score may exceed the data type range
+    """
+    if dtype.kind in "iu":
+        limit: float = float(np.iinfo(dtype).max)
+    elif dtype.kind == "f":
+        limit = float(np.finfo(dtype).max)  # pylint: disable=no-member
+    else:
+        return
+
+    if steps * float(max_cost) > limit:
+        raise OverflowError(
+            f"Score of {steps} steps at cost {max_cost} may overflow {dtype}"
+        )
+
+
 def linear_search(
     subject: VectorItem, target: Vector, cost_function: CostFunction
 ) -> Tuple[Vector, float]:
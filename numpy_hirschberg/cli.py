@@ -0,0 +1,616 @@
+"""
+Command line pipeline aligning sequence pairs in bulk.
+
+The pairs are streamed from an input file in chunks, aligned by a pool of worker
+processes and written out in the input order as soon as each chunk is done.
+
+Input formats (consecutive sequences make a pair):
+    * ``fasta`` - sequence records of letters
+    * ``csv`` - ``track,latitude,longitude`` rows, grouped by the track column
+    * ``npy`` - an array of equal-length sequences along the first axis (memory mapped)
+    * ``npz`` - an archive of arrays, one sequence per array
+
+Output formats:
+    * ``jsonl`` - one JSON object per pair: index, score and the padded sequences
+    * ``binary`` - one record per pair: the header ``<qdI`` (index, score, length)
+      followed by two int32 vectors mapping the aligned positions to the source
+      and target indices, -1 for a gap. Only the header is written for the score.
+
+The score is the total cost of the :func:`numpy_hirschberg.align.align` result.
+With ``--score-only`` it is the optimal Needleman-Wunsch score instead, i.e. the last
+cell of :func:`numpy_hirschberg.align.score_matrix`. The two may differ: aligning
+a single item, ``align`` always replaces it rather than deleting it.
+
+The deletion and insertion costs are required: the scores are maximised, so there
+is no price sensible for every cost function.
+
+A state file keeps the number of pairs and bytes written. Given again, it resumes
+the run from that pair, truncating the output to that byte offset first, so a record
+written partially or twice by an interrupted run is dropped. The ``npy`` and ``npz``
+inputs are indexed directly on resume, the text ones are scanned up to the offset
+without parsing the skipped sequences.
+
+Usage:
+    numpy-hirschberg pairs.fasta --deletion-cost -2 --insertion-cost -2 \\
+        --output result.jsonl --workers 4 --state result.state
+"""
+import argparse
+import csv
+import importlib
+import json
+import os
+import struct
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import chain, groupby, islice
+from typing import IO, Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from numpy_hirschberg.align import align, score_matrix, SCORE_DTYPES
+from numpy_hirschberg.distance import geo_distance, match_distance, symbol_distance
+from numpy_hirschberg.types import CostFunction, Vector
+
+COST_FUNCTIONS: Dict[str, CostFunction] = {
+    "match": match_distance,
+    "symbol": symbol_distance,
+    "geo": geo_distance,
+}
+"""Predefined cost functions available by name."""
+
+DEFAULT_COSTS: Dict[str, str] = {"fasta": "match", "csv": "geo", "npy": "geo", "npz": "geo"}
+"""Cost function used for an input format unless given explicitly."""
+
+RECORD_HEADER = struct.Struct("<qdI")
+"""Binary record header: pair index, score and the alignment length."""
+
+Pair = Tuple[Vector, Vector]
+
+
+def read_fasta(path: str, skip: int = 0) -> Iterator[Vector]:
+    """
+    Read sequence records from a FASTA file one by one.
+
+    :param path: the file path
+    :param skip: number of records to skip without parsing
+    :return: an iterator of letter vectors
+    """
+    with open(path, encoding="utf-8") as stream:
+        letters: Optional[List[str]] = None
+        for line in stream:
+            line = line.strip()
+            if line.startswith(">"):
+                if letters is not None:
+                    yield np.array(letters)
+                letters = None if skip > 0 else []
+                skip -= 1
+            elif letters is not None:
+                letters.extend(line)
+        if letters is not None:
+            yield np.array(letters)
+
+
+def read_csv(path: str, skip: int = 0) -> Iterator[Vector]:
+    """
+    Read tracks from a CSV file of ``track,latitude,longitude`` rows.
+
+    Consecutive rows with the same track value form a track. The first row is taken
+    for a header if neither coordinate is a number.
+
+    :param path: the file path
+    :param skip: number of tracks to skip without parsing
+    :return: an iterator of (latitude, longitude) vectors
+    """
+    with open(path, encoding="utf-8", newline="") as stream:
+        rows: Iterator[List[str]] = (row for row in csv.reader(stream) if row)
+        first: Optional[List[str]] = next(rows, None)
+        if first is None:
+            return
+        if len(first) < 3:
+            raise ValueError(f"{path}: expected track,latitude,longitude rows")
+        if is_number(first[1]) or is_number(first[2]):
+            rows = chain([first], rows)
+
+        tracks = groupby(rows, key=lambda row: row[0])
+        for _, track in islice(tracks, skip, None):
+            yield np.array([track_point(path, row) for row in track])
+
+
+def is_number(value: str) -> bool:
+    """
+    Check if a CSV value is a number.
+
+    :param value: the value
+    :return: True for a number
+    """
+    try:
+        float(value)
+    except ValueError:
+        return False
+    return True
+
+
+def track_point(path: str, row: List[str]) -> Tuple[float, float]:
+    """
+    Parse the coordinates of a CSV track row.
+
+    :param path: the file path, for the error message
+    :param row: ``track,latitude,longitude`` values
+    :return: the (latitude, longitude) point
+    :raises ValueError: if the row is malformed
+    """
+    if len(row) < 3:
+        raise ValueError(f"{path}: expected track,latitude,longitude rows, got {row}")
+    return float(row[1]), float(row[2])
+
+
+def read_npy(path: str, skip: int = 0) -> Iterator[Vector]:
+    """
+    Read sequences along the first axis of a memory-mapped array.
+
+    :param path: the file path
+    :param skip: number of sequences to skip
+    :return: an iterator of vectors
+    """
+    array: Vector = np.load(path, mmap_mode="r")
+    for index in range(skip, len(array)):
+        yield np.asarray(array[index])  # pylint: disable=unsubscriptable-object
+
+
+def read_npz(path: str, skip: int = 0) -> Iterator[Vector]:
+    """
+    Read arrays of an archive one by one in the stored order.
+
+    :param path: the file path
+    :param skip: number of arrays to skip
+    :return: an iterator of vectors
+    """
+    with np.load(path) as archive:
+        for name in archive.files[skip:]:
+            yield archive[name]
+
+
+READERS: Dict[str, Callable[[str, int], Iterator[Vector]]] = {
+    "fasta": read_fasta,
+    "csv": read_csv,
+    "npy": read_npy,
+    "npz": read_npz,
+}
+"""Sequence readers by the input format."""
+
+
+def read_pairs(path: str, input_format: str, skip: int = 0) -> Iterator[Pair]:
+    """
+    Stream the pairs of consecutive sequences from a file.
+
+    :param path: the file path
+    :param input_format: one of the :data:`READERS` keys
+    :param skip: number of pairs to skip
+    :return: an iterator of (source, target) tuples
+    :raises ValueError: if the file holds an odd number of sequences
+    """
+    sequences: Iterator[Vector] = READERS[input_format](path, 2 * skip)
+    for source in sequences:
+        target: Optional[Vector] = next(sequences, None)
+        if target is None:
+            raise ValueError(f"{path} holds an odd number of sequences")
+        yield source, target
+
+
+def read_chunks(pairs: Iterable[Pair], size: int) -> Iterator[List[Pair]]:
+    """
+    Split the pairs into lists of the given size.
+
+    :param pairs: the pair stream
+    :param size: number of pairs in a chunk
+    :return: an iterator of chunks
+    """
+    iterator: Iterator[Pair] = iter(pairs)
+    chunk: List[Pair] = list(islice(iterator, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, size))
+
+
+def load_cost_function(name: str) -> CostFunction:
+    """
+    Find a cost function by the predefined name or the ``module:function`` path.
+
+    :param name: the cost function name
+    :return: the cost function
+    :raises ValueError: if the name is not a predefined one nor a path
+    """
+    if name in COST_FUNCTIONS:
+        return COST_FUNCTIONS[name]
+    if ":" not in name:
+        raise ValueError(f"Unknown cost function {name}")
+    module_name, function_name = name.split(":", 1)
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def gap_positions(padded: Vector) -> Vector:
+    """
+    Map the aligned positions to the original sequence indices.
+
+    :param padded: a sequence padded with None
+    :return: an int32 vector of indices, -1 for a gap
+    """
+    if padded.dtype != object:
+        return np.arange(len(padded), dtype=np.int32)
+
+    items: Vector = padded.reshape(len(padded), -1)[:, 0]
+    gaps: Vector = np.array([item is None for item in items], dtype=bool)
+    positions: Vector = np.cumsum(~gaps, dtype=np.int32) - 1
+    positions[gaps] = -1
+    return positions
+
+
+def encode_json(
+    index: int, score: float, source: Optional[Vector], target: Optional[Vector]
+) -> bytes:
+    """
+    Encode a pair result as a JSON line.
+
+    :param index: the pair index in the input
+    :param score: total cost of the alignment
+    :param source: padded source or None if only the score is calculated
+    :param target: padded target or None if only the score is calculated
+    :return: the encoded line
+    """
+    record: Dict[str, Any] = {"index": index, "score": float(score)}
+    if source is not None and target is not None:
+        record["source"] = source.tolist()
+        record["target"] = target.tolist()
+    return (json.dumps(record, default=lambda item: item.item()) + "\n").encode("utf-8")
+
+
+def encode_binary(
+    index: int, score: float, source: Optional[Vector], target: Optional[Vector]
+) -> bytes:
+    """
+    Encode a pair result as a binary record, see :data:`RECORD_HEADER`.
+
+    :param index: the pair index in the input
+    :param score: total cost of the alignment
+    :param source: padded source or None if only the score is calculated
+    :param target: padded target or None if only the score is calculated
+    :return: the encoded record
+    """
+    if source is None or target is None:
+        return RECORD_HEADER.pack(index, score, 0)
+    return (
+        RECORD_HEADER.pack(index, score, len(source))
+        + gap_positions(source).astype("<i4").tobytes()
+        + gap_positions(target).astype("<i4").tobytes()
+    )
+
+
+ENCODERS: Dict[str, Callable[[int, float, Optional[Vector], Optional[Vector]], bytes]] = {
+    "jsonl": encode_json,
+    "binary": encode_binary,
+}
+"""Result encoders by the output format."""
+
+
+def process_chunk(  # pylint: disable=too-many-arguments
+    offset: int,
+    chunk: List[Pair],
+    cost_name: str,
+    deletion_cost: float,
+    insertion_cost: float,
+    score_dtype: Optional[str],
+    score_only: bool,
+    output_format: str,
+) -> bytes:
+    """
+    Align a chunk of pairs in a worker process.
+
+    :param offset: index of the first pair in the chunk
+    :param chunk: the pairs
+    :param cost_name: the cost function name, see :func:`load_cost_function`
+    :param deletion_cost: fixed price for the source item deletion
+    :param insertion_cost: fixed price for the target item insertion
+    :param score_dtype: data type of the score rows
+    :param score_only: calculate the optimal score only, skip the alignment
+    :param output_format: one of the :data:`ENCODERS` keys
+    :return: the encoded results
+    """
+    cost_function: CostFunction = load_cost_function(cost_name)
+    encode = ENCODERS[output_format]
+    results: List[bytes] = []
+
+    for index, (source, target) in enumerate(chunk, offset):
+        result = process_pair(
+            source, target, cost_function, deletion_cost, insertion_cost, score_dtype, score_only
+        )
+        results.append(encode(index, *result))
+    return b"".join(results)
+
+
+def process_pair(  # pylint: disable=too-many-arguments
+    source: Vector,
+    target: Vector,
+    cost_function: CostFunction,
+    deletion_cost: float,
+    insertion_cost: float,
+    score_dtype: Optional[str],
+    score_only: bool,
+) -> Tuple[float, Optional[Vector], Optional[Vector]]:
+    """
+    Align a pair or calculate the optimal score only.
+
+    :param source: one vector
+    :param target: another vector
+    :param cost_function: dynamic replacement cost algorithm
+    :param deletion_cost: fixed price for the source item deletion
+    :param insertion_cost: fixed price for the target item insertion
+    :param score_dtype: data type of the score rows
+    :param score_only: calculate the optimal score only, skip the alignment
+    :return: the score and the padded source and target, None for the score only
+    """
+    if score_only:
+        last_row: Vector = score_matrix(
+            source, target, cost_function, deletion_cost, insertion_cost, score_dtype
+        )
+        return (last_row[-1] if len(last_row) else 0), None, None
+
+    padded_source, padded_target, score = align(
+        source, target, cost_function, deletion_cost, insertion_cost, score_dtype
+    )
+    return score, padded_source, padded_target
+
+
+def read_state(path: Optional[str]) -> Optional[Tuple[int, int]]:
+    """
+    Read the number of pairs and bytes written in a previous run.
+
+    :param path: the state file path, if any
+    :return: the number of pairs to skip and the output offset, or None without a state
+    :raises ValueError: if the state file is malformed
+    """
+    if path is None or not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as stream:
+        values: List[str] = stream.read().split()
+    if len(values) != 2:
+        raise ValueError(f"{path}: expected the number of pairs and bytes written")
+    return int(values[0]), int(values[1])
+
+
+def write_state(path: Optional[str], done: int, position: int) -> None:
+    """
+    Save the number of pairs and bytes written, atomically.
+
+    :param path: the state file path, if any
+    :param done: the number of pairs
+    :param position: the output byte offset
+    """
+    if path is None:
+        return
+    temporary: str = path + ".tmp"
+    with open(temporary, "w", encoding="utf-8") as stream:
+        stream.write(f"{done} {position}\n")
+    os.replace(temporary, path)
+
+
+def report_progress(stream: IO[str], done: int, skipped: int, started: float) -> None:
+    """
+    Print the number of pairs done and the throughput.
+
+    :param stream: where to print
+    :param done: total number of pairs written
+    :param skipped: number of pairs skipped on resume
+    :param started: start time of the run
+    """
+    elapsed: float = max(time.monotonic() - started, 1e-9)
+    print(
+        f"{done} pairs, {(done - skipped) / elapsed:.1f} pairs/s",
+        file=stream,
+        flush=True,
+    )
+
+
+def run(  # pylint: disable=too-many-locals
+    arguments: argparse.Namespace, output: IO[bytes], skipped: int = 0, position: int = 0
+) -> int:
+    """
+    Stream the pairs through the worker pool and write the results in the input order.
+
+    No more than two chunks per worker are kept in memory at once.
+    The state is saved after each chunk, see :func:`write_state`.
+
+    :param arguments: parsed command line arguments
+    :param output: binary stream for the results
+    :param skipped: number of pairs to skip
+    :param position: output byte offset of the first result
+    :return: the number of pairs written, including the skipped ones
+    """
+    done: int = skipped
+    started: float = time.monotonic()
+    reported: float = started
+
+    pairs: Iterator[Pair] = read_pairs(arguments.input, arguments.input_format, skipped)
+    pending: Deque[Tuple["Future[bytes]", int]] = deque()
+
+    with ProcessPoolExecutor(max_workers=arguments.workers) as executor:
+        chunks: Iterator[List[Pair]] = read_chunks(pairs, arguments.chunk_size)
+        offset: int = skipped
+        try:
+            while True:
+                while len(pending) < 2 * arguments.workers:
+                    chunk: Optional[List[Pair]] = next(chunks, None)
+                    if chunk is None:
+                        break
+                    future = executor.submit(
+                        process_chunk,
+                        offset,
+                        chunk,
+                        arguments.cost,
+                        arguments.deletion_cost,
+                        arguments.insertion_cost,
+                        arguments.score_dtype,
+                        arguments.score_only,
+                        arguments.output_format,
+                    )
+                    pending.append((future, len(chunk)))
+                    offset += len(chunk)
+                if not pending:
+                    break
+
+                future, size = pending.popleft()
+                results: bytes = future.result()
+                output.write(results)
+                output.flush()
+                done += size
+                position += len(results)
+                write_state(arguments.state, done, position)
+
+                if arguments.progress and time.monotonic() - reported >= arguments.progress:
+                    reported = time.monotonic()
+                    report_progress(sys.stderr, done, skipped, started)
+        finally:
+            for future, _ in pending:
+                future.cancel()
+
+    if arguments.progress:
+        report_progress(sys.stderr, done, skipped, started)
+    return done
+
+
+def guess_format(path: str) -> str:
+    """
+    Guess the input format by the file extension.
+
+    :param path: the file path
+    :return: one of the :data:`READERS` keys
+    :raises ValueError: if the extension is unknown
+    """
+    extension: str = os.path.splitext(path)[1].lower().lstrip(".")
+    if extension in ("fa", "fasta", "fna"):
+        return "fasta"
+    if extension in READERS:
+        return extension
+    raise ValueError(f"Can't guess the format of {path}, use --input-format")
+
+
+def cost_value(value: str) -> float:
+    """
+    Parse a fixed price, keeping whole numbers integer for the integer score types.
+
+    :param value: the command line value
+    :return: the price
+    :raises ValueError: if the value is not a number
+    """
+    number: float = float(value)
+    return int(number) if number.is_integer() else number
+
+
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse the command line.
+
+    :param argv: the arguments, sys.argv by default
+    :return: the parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        prog="numpy-hirschberg", description="Align sequence pairs from a file in bulk."
+    )
+    parser.add_argument("input", help="file of sequences, consecutive ones make a pair")
+    parser.add_argument("-o", "--output", help="result file, stdout by default")
+    parser.add_argument("--input-format", choices=sorted(READERS), help="by the file extension")
+    parser.add_argument("--output-format", choices=sorted(ENCODERS), default="jsonl")
+    parser.add_argument(
+        "--cost",
+        help="cost function: " + ", ".join(COST_FUNCTIONS) + " or module:function",
+    )
+    parser.add_argument(
+        "--deletion-cost", type=cost_value, required=True, help="source item deletion price"
+    )
+    parser.add_argument(
+        "--insertion-cost", type=cost_value, required=True, help="target item insertion price"
+    )
+    parser.add_argument(
+        "--score-dtype", choices=[np.dtype(dtype).name for dtype in SCORE_DTYPES]
+    )
+    parser.add_argument(
+        "--score-only",
+        action="store_true",
+        help="calculate the optimal Needleman-Wunsch score only, may differ from the alignment",
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=100, help="pairs per task")
+    parser.add_argument("--skip", type=int, default=0, help="number of pairs to skip")
+    parser.add_argument("--state", help="file keeping the offset to resume from")
+    parser.add_argument(
+        "--progress", type=float, default=0, help="report interval in seconds, 0 to disable"
+    )
+
+    arguments = parser.parse_args(argv)
+    if arguments.workers < 1 or arguments.chunk_size < 1:
+        parser.error("--workers and --chunk-size must be positive")
+    if arguments.input_format is None:
+        try:
+            arguments.input_format = guess_format(arguments.input)
+        except ValueError as error:
+            parser.error(str(error))
+    if arguments.cost is None:
+        arguments.cost = DEFAULT_COSTS[arguments.input_format]
+    try:
+        load_cost_function(arguments.cost)
+    except (ValueError, ImportError, AttributeError) as error:
+        parser.error(f"bad cost function {arguments.cost}: {error}")
+    return arguments
+
+
+def open_output(path: str, state: Optional[Tuple[int, int]], append: bool) -> IO[bytes]:
+    """
+    Open the result file, truncated to the offset of the state if any.
+
+    :param path: the result file path
+    :param state: the number of pairs and bytes written in a previous run
+    :param append: keep the existing results when there is no state
+    :return: the binary stream positioned at the end of the kept results
+    :raises ValueError: if the file is shorter than the state offset
+    """
+    if state is None:
+        return open(path, "ab" if append else "wb")  # pylint: disable=consider-using-with
+
+    position: int = state[1]
+    size: int = os.path.getsize(path) if os.path.exists(path) else 0
+    if size < position:
+        raise ValueError(f"{path} is shorter than the {position} bytes saved in the state")
+    output: IO[bytes] = open(path, "r+b" if size else "wb")  # pylint: disable=consider-using-with
+    output.truncate(position)
+    output.seek(position)
+    return output
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Console entry point.
+
+    Errors are reported on stderr with a non-zero exit status.
+
+    :param argv: the arguments, sys.argv by default
+    """
+    arguments = parse_arguments(argv)
+
+    try:
+        state: Optional[Tuple[int, int]] = read_state(arguments.state)
+        skipped: int = max(arguments.skip, state[0] if state else 0)
+
+        if arguments.output is None:
+            run(arguments, sys.stdout.buffer, skipped, state[1] if state else 0)
+            return
+
+        with open_output(arguments.output, state, arguments.skip > 0) as output:
+            run(arguments, output, skipped, output.tell())
+    except (OSError, ValueError, TypeError, OverflowError) as error:
+        print(f"numpy-hirschberg: error: {error}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 """
 A couple of supplementary functions for distance measurement.
+
+The functions can be used as the cost function of :func:`numpy_hirschberg.align.align`.
 """
 from typing import Tuple
 
@@ -3,7 +3,7 @@ Vector type definitions used in the package.
 
 The Vector is based on the :obj:`numpy.typing.NDArray` with a type hint.
 """
-from typing import TypeVar, Tuple, Callable
+from typing import Any, TypeVar, Tuple, Callable
 
 import numpy
 from typing_extensions import TypeAlias
@@ -18,12 +18,14 @@ if numpy.__version__ >= "1.20":
     IntVector: TypeAlias = numpy.typing.NDArray[int]
     FloatVector: TypeAlias = numpy.typing.NDArray[float]
     GeoVector: TypeAlias = numpy.typing.NDArray[Tuple[float, float]]
+    ScoreType: TypeAlias = numpy.typing.DTypeLike
 else:
     Vector: TypeAlias = numpy.ndarray  # type: ignore
     StringVector: TypeAlias = numpy.ndarray  # type: ignore
     IntVector: TypeAlias = numpy.ndarray  # type: ignore
     FloatVector: TypeAlias = numpy.ndarray  # type: ignore
     GeoVector: TypeAlias = numpy.ndarray  # type: ignore
+    ScoreType: TypeAlias = Any  # type: ignore
 
 
 CostFunction: TypeAlias = Callable[[VectorItem, Vector], Vector]
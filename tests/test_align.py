@@ -1,14 +1,16 @@
 """
 Test for the main align() function.
 """
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import Tuple
 
 import numpy as np
 import pytest
 
-from numpy_hirschberg.align import align
+from numpy_hirschberg.align import align, divide_and_align
 from numpy_hirschberg.types import StringVector
-from tests.distance import symbol_distance, match_distance
+from numpy_hirschberg.distance import symbol_distance, match_distance
 
 
 def test_align_empty():
@@ -155,3 +157,122 @@ def test_align(source: str, target: str, alignments: Tuple[list, list, int]):
     assert np.array_equal(first, np.array(alignments[0]))
     assert np.array_equal(second, np.array(alignments[1]))
     assert distance == alignments[2]
+
+
+@pytest.mark.parametrize("score_dtype", [np.int16, np.float32])
+def test_align_score_dtype(score_dtype):
+    """
+    Test the alignment doesn't depend on the score data type.
+
+    :param score_dtype: data type of the score rows
+    """
+    # given
+    source_vector: StringVector = np.array(list("AGTACGCA"))
+    target_vector: StringVector = np.array(list("TATGC"))
+
+    # when
+    first, second, distance = align(
+        source_vector,
+        target_vector,
+        deletion_cost=-2,
+        insertion_cost=-2,
+        cost_function=match_distance,
+        score_dtype=score_dtype,
+    )
+
+    # then
+    assert np.array_equal(first, np.array(list("AGTACGCA")))
+    assert np.array_equal(second, np.array([None, None, "T", "A", "T", "G", "C", None]))
+    assert distance == 1
+
+
+@pytest.mark.parametrize(
+    ("source", "target"),
+    [
+        ("AGTACGCA", "TATGC"),
+        ("GAAAAAAT", "GAAT"),
+        ("ACGTTGCA", "ACGTTGCA"),
+    ],
+)
+def test_align_parallel(source: str, target: str):
+    """
+    Test the concurrent score passes give the same result as the sequential ones.
+
+    :param source: one string
+    :param target: another string
+    """
+    # given
+    source_vector: StringVector = np.array(list(source))
+    target_vector: StringVector = np.array(list(target))
+    arguments = {"deletion_cost": -2, "insertion_cost": -2, "cost_function": match_distance}
+
+    # when
+    expected = align(source_vector, target_vector, **arguments)
+    first, second, distance = align(source_vector, target_vector, parallel=True, **arguments)
+
+    # then
+    assert np.array_equal(first, expected[0])
+    assert np.array_equal(second, expected[1])
+    assert distance == expected[2]
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    """
+    Thread pool counting the submitted tasks.
+    """
+
+    def __init__(self):
+        super().__init__(max_workers=1)
+        self.submitted = 0
+
+    def submit(self, *args, **kwargs):  # pylint: disable=arguments-differ
+        """
+        Count and submit a task.
+        """
+        self.submitted += 1
+        return super().submit(*args, **kwargs)
+
+
+@pytest.mark.parametrize(("min_cells", "submitted"), [(0, 5), (1 << 16, 0)])
+def test_align_parallel_executor(monkeypatch, min_cells: int, submitted: int):
+    """
+    Test the backward score passes go to the executor unless they are too small.
+
+    :param min_cells: the smallest backward pass submitted to the executor
+    :param submitted: expected number of submitted passes
+    """
+    # given
+    # the package exports the align() function under the module name
+    monkeypatch.setattr(sys.modules["numpy_hirschberg.align"], "PARALLEL_MIN_CELLS", min_cells)
+    source_vector: StringVector = np.array(list("AGTACGCA"))
+    target_vector: StringVector = np.array(list("TATGC"))
+
+    # when
+    with CountingExecutor() as executor:
+        first, second, distance = divide_and_align(
+            source_vector, target_vector, match_distance, -2, -2, None, executor
+        )
+
+    # then
+    assert executor.submitted == submitted
+    assert np.array_equal(first, np.array(list("AGTACGCA")))
+    assert np.array_equal(second, np.array([None, None, "T", "A", "T", "G", "C", None]))
+    assert distance == 1
+
+
+@pytest.mark.parametrize("source", ["A", "AGTACGCA"])
+@pytest.mark.parametrize("score_dtype", ["bogus", np.int8])
+def test_align_score_dtype_error(source: str, score_dtype):
+    """
+    Test an unsupported score type is rejected whatever the vector length.
+
+    :param source: one string
+    :param score_dtype: data type of the score rows
+    """
+    # given
+    source_vector: StringVector = np.array(list(source))
+    target_vector: StringVector = np.array(list("TG"))
+
+    # then
+    with pytest.raises(ValueError):
+        align(source_vector, target_vector, match_distance, score_dtype=score_dtype)
@@ -0,0 +1,387 @@
+"""
+Test for the command line pipeline.
+"""
+import json
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import pytest
+
+from numpy_hirschberg.cli import (
+    RECORD_HEADER,
+    encode_binary,
+    gap_positions,
+    main,
+    read_csv,
+    read_fasta,
+    read_npy,
+    read_npz,
+    read_pairs,
+)
+
+FASTA = """>first
+AGTA
+CGCA
+>second
+TATGC
+>third
+GAAAAAAT
+>fourth
+GAAT
+"""
+
+
+def test_read_fasta(tmp_path: Path):
+    """
+    Test for the multiline FASTA records reading.
+    """
+    # given
+    path = tmp_path / "pairs.fasta"
+    path.write_text(FASTA)
+
+    # when
+    sequences = ["".join(sequence) for sequence in read_fasta(str(path))]
+
+    # then
+    assert sequences == ["AGTACGCA", "TATGC", "GAAAAAAT", "GAAT"]
+
+
+def test_read_fasta_skip(tmp_path: Path):
+    """
+    Test for the FASTA records skipped on resume.
+    """
+    # given
+    path = tmp_path / "pairs.fasta"
+    path.write_text(FASTA)
+
+    # when
+    sequences = ["".join(sequence) for sequence in read_fasta(str(path), skip=3)]
+
+    # then
+    assert sequences == ["GAAT"]
+
+
+def test_read_csv(tmp_path: Path):
+    """
+    Test for the tracks grouped by the first column, the header is skipped.
+    """
+    # given
+    path = tmp_path / "tracks.csv"
+    path.write_text("track,latitude,longitude\na,60,20\na,60.01,20.01\nb,50,20\n")
+
+    # when
+    tracks = [track.tolist() for track in read_csv(str(path))]
+
+    # then
+    assert tracks == [[[60, 20], [60.01, 20.01]], [[50, 20]]]
+
+
+def test_read_csv_skip(tmp_path: Path):
+    """
+    Test for the tracks skipped on resume, the file has no header.
+    """
+    # given
+    path = tmp_path / "tracks.csv"
+    path.write_text("a,60,20\na,60.01,20.01\nb,50,20\n")
+
+    # when
+    tracks = [track.tolist() for track in read_csv(str(path), skip=1)]
+
+    # then
+    assert tracks == [[[50, 20]]]
+
+
+@pytest.mark.parametrize("content", ["track\na\n", "a,abc,20\na,60,20\n"])
+def test_read_csv_malformed(tmp_path: Path, content: str):
+    """
+    Test for a CSV file of a single column or a bad coordinate in the first row.
+
+    :param content: the file content
+    """
+    # given
+    path = tmp_path / "tracks.csv"
+    path.write_text(content)
+
+    # then
+    with pytest.raises(ValueError):
+        list(read_csv(str(path)))
+
+
+def test_read_npz(tmp_path: Path):
+    """
+    Test for the archive arrays read in the stored order.
+    """
+    # given
+    path = tmp_path / "tracks.npz"
+    np.savez(str(path), first=np.array([1, 2]), second=np.array([3]))
+
+    # when
+    arrays = [array.tolist() for array in read_npz(str(path))]
+
+    # then
+    assert arrays == [[1, 2], [3]]
+
+
+def test_read_npy_skip(tmp_path: Path):
+    """
+    Test for the memory-mapped sequences skipped on resume.
+    """
+    # given
+    path = tmp_path / "tracks.npy"
+    np.save(str(path), np.arange(6).reshape(3, 2))
+
+    # when
+    arrays = [array.tolist() for array in read_npy(str(path), skip=2)]
+
+    # then
+    assert arrays == [[4, 5]]
+
+
+def test_read_pairs_odd(tmp_path: Path):
+    """
+    Test for a sequence without a pair.
+    """
+    # given
+    path = tmp_path / "odd.fasta"
+    path.write_text(">first\nAG\n")
+
+    # then
+    with pytest.raises(ValueError):
+        list(read_pairs(str(path), "fasta"))
+
+
+def test_gap_positions():
+    """
+    Test for the aligned positions mapped to the original indices.
+    """
+    # given
+    padded = np.array([None, "T", "A", None, "G"], dtype=object)
+
+    # then
+    assert gap_positions(padded).tolist() == [-1, 0, 1, -1, 2]
+
+
+def test_encode_binary():
+    """
+    Test for the binary record layout.
+    """
+    # given
+    source = np.array(list("AG"))
+    target = np.array(["A", None], dtype=object)
+
+    # when
+    record = encode_binary(3, -2.0, source, target)
+
+    # then
+    assert RECORD_HEADER.unpack_from(record) == (3, -2.0, 2)
+    assert np.frombuffer(record[RECORD_HEADER.size :], dtype="<i4").tolist() == [0, 1, 0, -1]
+
+
+@pytest.mark.parametrize("score_dtype", [None, "int16", "int32", "float32", "float64"])
+def test_main(tmp_path: Path, score_dtype: Optional[str]):
+    """
+    Test for the alignment of all the pairs written as JSON lines.
+
+    :param score_dtype: data type of the score rows
+    """
+    # given
+    source_path = tmp_path / "pairs.fasta"
+    source_path.write_text(FASTA)
+    output_path = tmp_path / "result.jsonl"
+    options = [f"--score-dtype={score_dtype}"] if score_dtype else []
+
+    # when
+    main(
+        [
+            str(source_path),
+            f"--output={output_path}",
+            "--deletion-cost=-2",
+            "--insertion-cost=-2",
+            "--workers=2",
+            "--chunk-size=1",
+            *options,
+        ]
+    )
+
+    # then
+    records = [json.loads(line) for line in output_path.read_text().splitlines()]
+    assert records == [
+        {
+            "index": 0,
+            "score": 1,
+            "source": list("AGTACGCA"),
+            "target": [None, None, "T", "A", "T", "G", "C", None],
+        },
+        {
+            "index": 1,
+            "score": 0,
+            "source": list("GAAAAAAT"),
+            "target": ["G", None, None, None, "A", None, "A", "T"],
+        },
+    ]
+
+
+def test_main_score_only(tmp_path: Path):
+    """
+    Test the score-only path gives the alignment cost.
+    """
+    # given
+    source_path = tmp_path / "pairs.fasta"
+    source_path.write_text(FASTA)
+    output_path = tmp_path / "result.bin"
+
+    # when
+    main(
+        [
+            str(source_path),
+            f"--output={output_path}",
+            "--output-format=binary",
+            "--score-only",
+            "--deletion-cost=-2",
+            "--insertion-cost=-2",
+            "--workers=1",
+        ]
+    )
+
+    # then
+    records = list(RECORD_HEADER.iter_unpack(output_path.read_bytes()))
+    assert records == [(0, 1.0, 0), (1, 0.0, 0)]
+
+
+def test_main_score_only_optimal(tmp_path: Path):
+    """
+    Test the score-only path gives the optimal score, better than the alignment cost
+    when a single item is forced to a replacement.
+    """
+    # given
+    source_path = tmp_path / "pairs.fasta"
+    source_path.write_text(">first\nA\n>second\nCCC\n")
+    arguments = [str(source_path), "--deletion-cost=0", "--insertion-cost=0", "--workers=1"]
+
+    # when
+    main([*arguments, f"--output={tmp_path / 'align.jsonl'}"])
+    main([*arguments, f"--output={tmp_path / 'score.jsonl'}", "--score-only"])
+
+    # then
+    assert json.loads((tmp_path / "align.jsonl").read_text())["score"] == -1
+    assert json.loads((tmp_path / "score.jsonl").read_text())["score"] == 0
+
+
+def test_main_resume(tmp_path: Path):
+    """
+    Test the run continues from the offset in the state file and appends the results.
+    """
+    # given
+    source_path = tmp_path / "pairs.fasta"
+    source_path.write_text(FASTA)
+    output_path = tmp_path / "result.jsonl"
+    output_path.write_text('{"index": 0}\n')
+    state_path = tmp_path / "result.state"
+    state_path.write_text("1 13\n")
+
+    # when
+    main(
+        [
+            str(source_path),
+            f"--output={output_path}",
+            f"--state={state_path}",
+            "--score-only",
+            "--deletion-cost=-2",
+            "--insertion-cost=-2",
+            "--workers=1",
+        ]
+    )
+
+    # then
+    indices = [json.loads(line)["index"] for line in output_path.read_text().splitlines()]
+    assert indices == [0, 1]
+    assert state_path.read_text() == f"2 {output_path.stat().st_size}\n"
+
+
+def test_main_resume_partial(tmp_path: Path):
+    """
+    Test the results written after the state offset by an interrupted run are dropped.
+    """
+    # given
+    source_path = tmp_path / "pairs.fasta"
+    source_path.write_text(FASTA)
+    output_path = tmp_path / "result.bin"
+    first_record = RECORD_HEADER.pack(0, 1.0, 0)
+    # the second record written twice: completely and partially
+    second_record = RECORD_HEADER.pack(1, 0.0, 0)
+    output_path.write_bytes(first_record + second_record + second_record[:5])
+    state_path = tmp_path / "result.state"
+    state_path.write_text(f"1 {len(first_record)}\n")
+
+    # when
+    main(
+        [
+            str(source_path),
+            f"--output={output_path}",
+            f"--state={state_path}",
+            "--output-format=binary",
+            "--score-only",
+            "--deletion-cost=-2",
+            "--insertion-cost=-2",
+            "--workers=1",
+        ]
+    )
+
+    # then
+    records = list(RECORD_HEADER.iter_unpack(output_path.read_bytes()))
+    assert records == [(0, 1.0, 0), (1, 0.0, 0)]
+
+
+@pytest.mark.parametrize(
+    ("sequences", "options", "status"),
+    [
+        (FASTA + ">odd\nA\n", [], 1),
+        (FASTA, ["--deletion-cost=-20000", "--score-dtype=int16"], 1),
+        (FASTA, ["--cost=tests.missing:distance"], 2),
+        (FASTA, ["--cost=unknown"], 2),
+        (FASTA, ["--deletion-cost=", "--insertion-cost=x"], 2),
+    ],
+)
+def test_main_error(capsys, tmp_path: Path, sequences: str, options: List[str], status: int):
+    """
+    Test the errors are reported with a message and an exit status.
+
+    :param sequences: the input file content
+    :param options: extra command line options
+    :param status: expected exit status
+    """
+    # given
+    source_path = tmp_path / "pairs.fasta"
+    source_path.write_text(sequences)
+    output_path = tmp_path / "result.jsonl"
+
+    # when
+    with pytest.raises(SystemExit) as exit_info:
+        main(
+            [
+                str(source_path),
+                f"--output={output_path}",
+                "--deletion-cost=-2",
+                "--insertion-cost=-2",
+                "--workers=1",
+                *options,
+            ]
+        )
+
+    # then
+    assert exit_info.value.code == status
+    assert "error:" in capsys.readouterr().err
+
+
+def test_main_unknown_format(tmp_path: Path):
+    """
+    Test for an input file of unknown format.
+    """
+    # given
+    source_path = tmp_path / "pairs.txt"
+    source_path.write_text(FASTA)
+
+    # then
+    with pytest.raises(SystemExit):
+        main([str(source_path)])
@@ -3,7 +3,7 @@ Test for the geo_distance() function.
 """
 import numpy as np
 
-from tests.distance import geo_distance
+from numpy_hirschberg.distance import geo_distance
 
 
 def test_geo_distance():
@@ -8,7 +8,7 @@ import pytest
 
 from numpy_hirschberg.align import linear_search
 from numpy_hirschberg.types import StringVector
-from tests.distance import symbol_distance
+from numpy_hirschberg.distance import symbol_distance
 
 
 @pytest.mark.parametrize(
@@ -4,7 +4,7 @@ Test for the match_distance() function.
 import numpy as np
 import pytest
 
-from tests.distance import match_distance
+from numpy_hirschberg.distance import match_distance
 from numpy_hirschberg.types import StringVector
 
 
@@ -8,7 +8,7 @@ import pytest
 
 from numpy_hirschberg.align import score_matrix
 from numpy_hirschberg.types import StringVector
-from tests.distance import match_distance
+from numpy_hirschberg.distance import match_distance, geo_distance
 
 
 def test_line_score_empty():
@@ -92,3 +92,98 @@ def test_line_score(source: str, target: str, score: List[float]):
 
     # then
     assert np.array_equal(line, score)
+
+
+@pytest.mark.parametrize("score_dtype", [np.int16, np.int32, np.float32, np.float64])
+def test_line_score_dtype(score_dtype):
+    """
+    Test for the same scores kept in a narrower data type.
+
+    :param score_dtype: data type of the score rows
+    """
+    # given
+    source_vector: StringVector = np.array(list("AGTA"))
+    target_vector: StringVector = np.array(list("TATGC"))
+
+    # when
+    line = score_matrix(
+        source_vector,
+        target_vector,
+        cost_function=match_distance,
+        insertion_cost=-2,
+        deletion_cost=-2,
+        score_dtype=score_dtype,
+    )
+
+    # then
+    assert line.dtype == score_dtype
+    assert np.array_equal(line, [-8, -4, 0, -2, -1, -3])
+
+
+def test_line_score_float_costs():
+    """
+    Test the float costs are not truncated by default.
+    """
+    # given
+    track = np.array([(60, 20), (60.01, 20.01)])
+
+    # when
+    line = score_matrix(
+        track[1:],
+        track[:1],
+        cost_function=geo_distance,
+        insertion_cost=-5000,
+        deletion_cost=-5000,
+    )
+
+    # then
+    assert line.dtype == np.float64
+    assert np.around(line, 3).tolist() == [-5000.0, -1243.159]
+
+
+@pytest.mark.parametrize(
+    ("score_dtype", "deletion_cost", "error"),
+    [
+        (np.int8, -2, ValueError),
+        (np.int16, -2.5, TypeError),
+        (np.int16, -20000, OverflowError),
+    ],
+)
+def test_line_score_dtype_error(score_dtype, deletion_cost: float, error: type):
+    """
+    Test for unsupported data types and the ones too narrow for the scores.
+
+    :param score_dtype: data type of the score rows
+    :param deletion_cost: fixed price for the source item deletion
+    :param error: expected exception
+    """
+    # given
+    source_vector: StringVector = np.array(list("AG"))
+    target_vector: StringVector = np.array(list("TA"))
+
+    # then
+    with pytest.raises(error):
+        score_matrix(
+            source_vector,
+            target_vector,
+            cost_function=match_distance,
+            deletion_cost=deletion_cost,
+            score_dtype=score_dtype,
+        )
+
+
+def test_line_score_cost_overflow():
+    """
+    Test the cost function results are checked against the data type range too.
+    """
+    # given
+    track = np.array([(60, 20), (0, 0)])
+
+    # then
+    with pytest.raises(OverflowError):
+        score_matrix(
+            track,
+            track,
+            cost_function=lambda point, line: geo_distance(point, line).astype(int),
+            score_dtype=np.int16,
+        )
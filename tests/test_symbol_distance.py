@@ -4,7 +4,7 @@ Test for the symbol_distance() function.
 import numpy as np
 import pytest
 
-from tests.distance import symbol_distance
+from numpy_hirschberg.distance import symbol_distance
 from numpy_hirschberg.types import StringVector
 
 